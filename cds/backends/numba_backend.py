@@ -0,0 +1,62 @@
+"""
+Numba-compiled kernels, parallel over hazard rates / simulations and without
+(n_sims, n_names) temporaries. Requires the optional numba dependency.
+"""
+import math
+
+import numba
+import numpy as np
+
+NAME = "numba"
+SQRT2 = math.sqrt(2.0)
+
+
+def set_num_threads(n: int) -> None:
+    numba.set_num_threads(n)
+
+
+@numba.njit(parallel=True, cache=True)
+def _survival_dot(lam, times, weights, out):
+    for i in numba.prange(lam.shape[0]):
+        acc = 0.0
+        for j in range(times.shape[0]):
+            acc += weights[j] * math.exp(-lam[i] * times[j])
+        out[i] = acc
+
+
+@numba.njit(parallel=True, cache=True)
+def _portfolio_loss(K, F, sqrt_rho, den, w, lgd, single, out):
+    for s in numba.prange(F.shape[0]):
+        acc = 0.0
+        for i in range(K.shape[0]):
+            x = (K[i] - sqrt_rho[i] * F[s]) / den[i]
+            if single:
+                # same rounding as the float32 ndtr of the numpy backend
+                x = np.float64(np.float32(x))
+                acc += w[i] * np.float64(np.float32(0.5 * math.erfc(-x / SQRT2)))
+            else:
+                acc += w[i] * 0.5 * math.erfc(-x / SQRT2)
+        out[s] = lgd * acc
+
+
+def survival_dot(lam: np.ndarray, times: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    lam = np.ascontiguousarray(lam, dtype=np.float64)
+    out = np.empty(lam.shape[0])
+    _survival_dot(lam, np.ascontiguousarray(times, dtype=np.float64), np.ascontiguousarray(weights, dtype=np.float64), out)
+    return out
+
+
+def portfolio_loss(K, F, sqrt_rho, den, w, lgd: float, dtype=np.float64) -> np.ndarray:
+    # nothing is buffered here, dtype only sets the rounding of N's argument and value
+    out = np.empty(F.shape[0])
+    _portfolio_loss(
+        np.ascontiguousarray(K, dtype=np.float64),
+        np.ascontiguousarray(F, dtype=np.float64),
+        np.ascontiguousarray(sqrt_rho, dtype=np.float64),
+        np.ascontiguousarray(den, dtype=np.float64),
+        np.ascontiguousarray(w, dtype=np.float64),
+        float(lgd),
+        np.dtype(dtype) == np.float32,
+        out,
+    )
+    return out
@@ -0,0 +1,27 @@
+import numpy as np
+from scipy.special import ndtr
+
+NAME = "numpy"
+BLOCK_SIZE = 1 << 20  # elements per float64 temporary in compact mode
+
+
+def survival_dot(lam: np.ndarray, times: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    return np.exp(-np.multiply.outer(lam, times)) @ weights
+
+
+def portfolio_loss(K, F, sqrt_rho, den, w, lgd: float, dtype=np.float64) -> np.ndarray:
+    """
+    The z-scores are formed in float64, then N(z) is evaluated and held in dtype.
+    In compact mode this runs a block of simulations at a time so the float64
+    temporaries stay small, and the weighted sum over names is accumulated in float64.
+    """
+    if dtype == np.float64:
+        return lgd * (ndtr((K[None, :] - sqrt_rho[None, :] * F[:, None]) / den[None, :]) @ w)
+
+    out = np.empty(F.shape[0])
+    rows = max(1, BLOCK_SIZE // max(1, K.shape[0]))
+    for start in range(0, F.shape[0], rows):
+        z = (K[None, :] - sqrt_rho[None, :] * F[start:start + rows, None]) / den[None, :]
+        Q_cond = ndtr(z.astype(dtype))  # (rows, n_names)
+        out[start:start + rows] = lgd * np.einsum("ij,j->i", Q_cond, w, dtype=np.float64)
+    return out
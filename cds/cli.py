@@ -0,0 +1,227 @@
+"""
+Command-line batch pricer.
+
+Prices a portfolio (ratings file + spread history) without plotting and writes
+the results to Parquet or CSV so the model can run in scheduled jobs:
+
+    cds --rating rating_data.json --spreads /path/to/spreads.json --out results/
+
+The spreads file is a JSON list of {"Company": ..., "Data": [{"Date", "Spread"}, ...]}.
+
+Two tables are written to the output directory:
+  flat_spreads: rating-implied flat spread per name (sharded by name)
+  index:        index price/spread, implied rho and loss stats per date (sharded by date)
+"""
+import argparse
+import importlib.util
+import multiprocessing
+import os
+from dataclasses import replace
+from datetime import date
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from cds.backends import backend_names, init_worker, set_backend
+from cds.data.build_portfolio import (
+    PATH_MARKET_INDEX_EXCEL,
+    PATH_MARKET_SPREADS,
+    PATH_RATING,
+    build_rating_df,
+    market_data,
+    spreads_to_df,
+)
+from cds.pricing.cds_engine import CDS, Params
+from cds.correlation.correlation_analysis import loss_distribution, summarize_losses
+from cds.correlation.gaussian_copula import implied_rho, spreads_to_pd
+
+FORMATS = ("csv", "parquet")
+PARQUET_ENGINES = ("pyarrow", "fastparquet")
+
+
+def _chunks(items: list, n_chunks: int) -> list[list]:
+    n_chunks = max(1, min(n_chunks, len(items)))
+    return [chunk.tolist() for chunk in np.array_split(np.asarray(items, dtype=object), n_chunks) if len(chunk)]
+
+
+def price_names(params: Params, rating_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rating-implied flat spread (bp) for every name in rating_df.
+    """
+    cds = CDS(params)
+    df = rating_df[["Company Name", "RATING"]].copy()
+    df["cds_flat_spread"] = df["RATING"].apply(lambda x: cds.flat_spread(x) * 10000)
+    return df
+
+
+def price_dates(params: Params, spreads_df: pd.DataFrame, market_bp: dict, opts: dict) -> pd.DataFrame:
+    """
+    Index spread, implied rho and loss statistics for every date in spreads_df.
+
+    :param market_bp: market index spread in bp keyed by date, dates without a quote get no implied rho
+    :param opts: rho, alpha, n_sims, seed, var_alpha and compact used for the copula,
+        imm_schedule prices every date on the IMM schedule traded on that date
+    """
+    # --trade-date only dates the flat_spreads table, the index table uses its own dates or none
+    cds = CDS(replace(params, trade_date=None))
+    rows = []
+    for day, df_day in spreads_df.groupby("Date", sort=True):
+        df_day = df_day.dropna(subset=["cds_flat_spread"]).reset_index(drop=True)
+        if df_day.empty:
+            continue
+        if opts["imm_schedule"]:
+            # schedules are cached per trade date, so this only builds each one once
+            cds = CDS(replace(params, trade_date=day.date()))
+
+        index_res = cds.index_from_component_spreads(df_day)
+        row = {
+            "Date": day,
+            "n_names": len(df_day),
+            "spread_avg_bp": float(df_day["cds_flat_spread"].mean()),
+            **index_res,
+        }
+
+        market = market_bp.get(day)
+        rho = opts["rho"]
+        if market is not None:
+            rho = implied_rho(df_day, market, cds, alpha=opts["alpha"])
+            row["market_bp"] = market
+            row["implied_rho"] = rho
+
+        df_port = pd.DataFrame({
+            "Q_T": spreads_to_pd(df_day, cds.T, cds.recovery),
+            "w": np.full(len(df_day), 1.0 / len(df_day)),
+        })
+        L = loss_distribution(df_port, rho=rho, n_sims=opts["n_sims"], seed=opts["seed"], compact=opts["compact"])
+        row["loss_rho"] = rho
+        row.update(summarize_losses(L, alpha=opts["var_alpha"]))
+        rows.append(row)
+
+    return pd.DataFrame(rows)
+
+
+def load_market_bp(path_excel: str) -> dict:
+    df = market_data(path_excel)
+    dates = pd.to_datetime(df["date"]).dt.normalize()
+    return dict(zip(dates, df["value"].astype(float) * 10000))
+
+
+def check_format(fmt: str) -> None:
+    """Fails before any pricing is done if the output format cannot be written."""
+    if fmt == "parquet" and not any(importlib.util.find_spec(engine) for engine in PARQUET_ENGINES):
+        raise ImportError("Parquet output needs pyarrow, install it with `pip install cds[parquet]` or use --format csv")
+
+
+def write_table(df: pd.DataFrame, out_dir: Path, name: str, fmt: str) -> Path:
+    path = out_dir / f"{name}.{fmt}"
+    if fmt == "parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def run(args: argparse.Namespace) -> dict[str, Path]:
+    params = Params(T=args.T, r=args.r, recovery=args.recovery, coupon=args.coupon, freq=args.freq,
+                    trade_date=args.trade_date)
+    check_format(args.format)
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    workers = args.workers or os.cpu_count() or 1
+    set_backend(args.backend)
+
+    rating_df = build_rating_df(args.rating)
+    spreads_df = spreads_to_df(args.spreads)
+    spreads_df["Date"] = spreads_df["Date"].dt.normalize()
+    market_bp = load_market_bp(args.market) if args.market else {}
+    opts = {
+        "rho": args.rho,
+        "alpha": args.alpha,
+        "n_sims": args.n_sims,
+        "seed": args.seed,
+        "var_alpha": args.var_alpha,
+        "compact": args.compact,
+        "imm_schedule": args.imm_schedule,
+    }
+
+    name_shards = [rating_df.iloc[idx] for idx in _chunks(list(range(len(rating_df))), workers)]
+    date_shards = [
+        spreads_df[spreads_df["Date"].isin(dates)]
+        for dates in _chunks(sorted(spreads_df["Date"].unique()), workers * args.shards_per_worker)
+    ]
+
+    # spawn rather than fork: forking after a backend has started its thread pool can deadlock
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker,
+        initargs=(args.backend,),
+    ) as pool:
+        names = list(pool.map(price_names, [params] * len(name_shards), name_shards))
+        dates = list(pool.map(
+            price_dates,
+            [params] * len(date_shards),
+            date_shards,
+            [market_bp] * len(date_shards),
+            [opts] * len(date_shards),
+        ))
+
+    flat = pd.concat(names, ignore_index=True) if names else pd.DataFrame()
+    index = pd.concat(dates, ignore_index=True) if dates else pd.DataFrame()
+    if not index.empty:
+        index = index.sort_values("Date").reset_index(drop=True)
+
+    return {
+        "flat_spreads": write_table(flat, out_dir, "flat_spreads", args.format),
+        "index": write_table(index, out_dir, "index", args.format),
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cds", description="Batch CDS portfolio pricer")
+    parser.add_argument("--rating", default=PATH_RATING, help="ratings json (relative paths resolve to cds/data)")
+    parser.add_argument("--spreads", default=PATH_MARKET_SPREADS, help="spread history json")
+    parser.add_argument("--market", default=None, nargs="?", const=PATH_MARKET_INDEX_EXCEL,
+                        help="market index excel, enables implied rho per date")
+    parser.add_argument("--out", default="results", help="output directory")
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size, defaults to all cores")
+    parser.add_argument("--shards-per-worker", type=int, default=4)
+    parser.add_argument("--backend", choices=backend_names(), default=os.environ.get("CDS_BACKEND", "numpy"),
+                        help="compute backend, auto picks the fastest one installed")
+
+    parser.add_argument("--T", type=int, default=5)
+    parser.add_argument("--r", type=float, default=0.02)
+    parser.add_argument("--recovery", type=float, default=0.4)
+    parser.add_argument("--coupon", type=float, default=0.05)
+    parser.add_argument("--freq", type=int, default=4)
+    parser.add_argument("--trade-date", type=date.fromisoformat, default=None,
+                        help="YYYY-MM-DD as-of date of the ratings, prices flat_spreads on IMM dates with ACT/360 accruals")
+    parser.add_argument("--imm-schedule", action="store_true",
+                        help="price each date of the index table on the IMM/ACT360 schedule traded on that date")
+
+    parser.add_argument("--rho", type=float, default=0.3, help="copula rho when no market quote is available")
+    parser.add_argument("--alpha", type=float, default=0.05, help="stress quantile for implied rho")
+    parser.add_argument("--n-sims", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--var-alpha", type=float, default=0.99)
+    parser.add_argument("--compact", action="store_true", help="float32 loss simulation")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        check_format(args.format)
+        set_backend(args.backend)
+    except (ImportError, ValueError) as e:
+        parser.error(str(e))
+    for name, path in run(args).items():
+        print(f"{name}: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,105 @@
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from scipy.special import ndtr
 from scipy.stats import norm
+from cds.backends import get_backend
 from cds.data.build_portfolio import build_portfolio_df
 
 RECOVERY = 0.40
 
-def conditional_default_prob(Q_T: np.ndarray, F: np.ndarray, rho: float) -> np.ndarray:
+# Compact mode holds the conditional default probabilities in float32 and sums
+# losses in float64. The z-scores (K - sqrt(rho) F) / sqrt(1 - rho) are formed in
+# float64 before rounding: cancellation in them is what breaks float32 as rho -> 1.
+# Rounding z and N(z) to float32 moves each N(z) by at most (1 + max_z z phi(z)) u
+# = 1.25 u with u = 2^-24, so against float64 on the same draws every simulated
+# loss and EL / VaR / ES are within 1.25 u (1 - RECOVERY) sum(w) = 4.5e-8 of notional
+# for weights summing to one, for any rho, portfolio size and backend (checked in
+# tests/test_compact.py). The bound is absolute: relative errors in the far tail,
+# where N(z) underflows in float32, can reach 100%.
+COMPACT_DTYPE = np.float32
+COMPACT_BLOCK_SIZE = 1 << 20  # elements per float64 temporary in compact mode
+
+def _dtype(compact: bool):
+    return COMPACT_DTYPE if compact else np.float64
+
+def conditional_default_prob(Q_T: np.ndarray, F: np.ndarray, rho: float, compact: bool = False) -> np.ndarray:
     """
     K_i = N^{-1}(Q_i(T))
     Q_i(T|F) = N((K_i - sqrt(rho) F)/sqrt(1-rho))
     Shapes:
       Q_T: (n_names,)
       F:   (n_sims,)
+      rho: scalar or (n_names,)
     Returns:
-      Q_cond: (n_sims, n_names)
+      Q_cond: (n_sims, n_names), float32 if compact
     """
     K = norm.ppf(Q_T)  # (n_names,)
+    F = np.asarray(F, dtype=float)
+    rho = np.asarray(rho, dtype=float)
     num = K[None, :] - np.sqrt(rho) * F[:, None]
     den = np.sqrt(1.0 - rho)
-    return norm.cdf(num / den)
+    return ndtr((num / den).astype(_dtype(compact), copy=False))
+
+def conditional_default_prob_factors(Q_T: np.ndarray, F: np.ndarray, B: np.ndarray, compact: bool = False) -> np.ndarray:
+    """
+    Multi-factor version with loadings B (e.g. from cds.correlation.rolling)
+    Q_i(T|F) = N((K_i - B_i . F)/sqrt(1 - |B_i|^2))
+    Shapes:
+      Q_T: (n_names,)
+      F:   (n_sims, n_factors)
+      B:   (n_names, n_factors)
+    Returns:
+      Q_cond: (n_sims, n_names), float32 if compact
+    """
+    K = norm.ppf(Q_T)
+    B = np.asarray(B, dtype=float)
+    num = K[None, :] - np.asarray(F, dtype=float) @ B.T
+    den = np.sqrt(1.0 - (B ** 2).sum(axis=1))
+    return ndtr((num / den).astype(_dtype(compact), copy=False))
 
-def loss_distribution(df_port: pd.DataFrame, rho: float, n_sims: int = 200_000, seed: int = 0) -> np.ndarray:
+def loss_distribution(df_port: pd.DataFrame, rho: float, n_sims: int = 200_000, seed: int = 0,
+                      loadings: np.ndarray | None = None, compact: bool = False) -> np.ndarray:
+    """
+    rho is a single correlation or one per name; if factor loadings (n_names, n_factors)
+    are given they replace rho. With compact=True the conditional default
+    probabilities are held in float32 (same random draws) and the losses are
+    summed in float64.
+    """
     rng = np.random.default_rng(seed)
-    F = rng.standard_normal(n_sims)  # common factor (market factor)
 
-    Q_T = df_port["Q_T"].to_numpy()
-    w = df_port["w"].to_numpy()
+    Q_T = df_port["Q_T"].to_numpy(dtype=float)
+    w = df_port["w"].to_numpy(dtype=float)
+
+    if loadings is None:
+        F = rng.standard_normal(n_sims)  # common factor (market factor)
+        # fused conditional_default_prob + weighted sum, see cds.backends
+        rho = np.broadcast_to(np.asarray(rho, dtype=float), Q_T.shape)
+        K = norm.ppf(Q_T)
+        return get_backend().portfolio_loss(K, F, np.sqrt(rho), np.sqrt(1.0 - rho), w, 1.0 - RECOVERY, _dtype(compact))
 
-    Q_cond = conditional_default_prob(Q_T, F, rho)  # (n_sims, n_names)
-    L = (1.0 - RECOVERY) * (Q_cond @ w)             # (n_sims,)
+    B = np.asarray(loadings, dtype=float).reshape(len(Q_T), -1)
+    F = rng.standard_normal((n_sims, B.shape[1]))
+    if not compact:
+        Q_cond = conditional_default_prob_factors(Q_T, F, B)  # (n_sims, n_names)
+        return (1.0 - RECOVERY) * (Q_cond @ w)                # (n_sims,)
+
+    # a block of simulations at a time so only block-sized float64 z-scores are live
+    L = np.empty(n_sims)
+    rows = max(1, COMPACT_BLOCK_SIZE // len(Q_T))
+    for start in range(0, n_sims, rows):
+        Q_cond = conditional_default_prob_factors(Q_T, F[start:start + rows], B, compact)
+        L[start:start + rows] = (1.0 - RECOVERY) * np.einsum("ij,j->i", Q_cond, w, dtype=np.float64)
     return L
 
 def summarize_losses(L: np.ndarray, alpha: float = 0.99) -> dict:
+    """
+    ES is the mean of the worst (1 - alpha) share of paths rather than of L >= VaR:
+    with many ties at VaR (rho near 1) the latter jumps when a tie moves by one ulp.
+    """
     var = np.quantile(L, alpha)
-    es = L[L >= var].mean()
+    k = max(1, int(round((1 - alpha) * len(L))))
+    es = np.partition(L, len(L) - k)[-k:].mean()
     return {
         "EL": float(L.mean()),
         f"VaR_{int(alpha*100)}": float(var),
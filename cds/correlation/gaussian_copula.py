@@ -3,7 +3,7 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from scipy.stats import norm
 from pathlib import Path
-from cds.pricing.cds_pricing_functions import fair_cds_spread
+from cds.pricing.schedule import build_schedule
 from cds.data.build_portfolio import build_portfolio_df
 from cds.pricing.cds_engine import CDS
 
@@ -31,24 +31,21 @@ def conditional_pd(Q_T: np.ndarray, rho, alpha):
     return norm.cdf(num / den)
 
 
-def pd_to_spreads_bp(Q_cond, T, r, recovery, freq):
+def pd_to_spreads_bp(Q_cond, T, r, recovery, freq, schedule=None):
     eps = 1e-10
     Q_cond = np.clip(Q_cond, eps, 1-eps)
     lambdas = -np.log(1-Q_cond) / T
-    
-    spreads_bp = []
-    for lam in lambdas:
-        s = fair_cds_spread(T, freq, r, lam, recovery)
-        spreads_bp.append(s * 10000)
 
-    return np.array(spreads_bp)  
+    if schedule is None:
+        schedule = build_schedule(T, freq, r)
+    return schedule.fair_spread(lambdas, recovery) * 10000
 
 
 def model_index_spread_from_rho(df_day, rho, alpha, cds):
     Q_T = spreads_to_pd(df_day, cds.T, cds.recovery)
     Q_cond = conditional_pd(Q_T, rho, alpha)
     stressed_spreads_bp = pd_to_spreads_bp(
-        Q_cond, cds.T, cds.r, cds.recovery, cds.freq
+        Q_cond, cds.T, cds.r, cds.recovery, cds.freq, schedule=cds.schedule
     )
 
     df_tmp = df_day.copy()
@@ -69,11 +66,7 @@ def index_spread_with_correlation(df, rho, alpha, T, r, recovery, freq):
     lambdas = hazard_from_cum_pd(Q_stress, T)
 
     # Compute single-name spreads
-    spreads = []
-    for lam in lambdas:
-        s = fair_cds_spread(T, freq, r, lam, recovery)
-        spreads.append(s)
-    spreads = np.array(spreads)
+    spreads = build_schedule(T, freq, r).fair_spread(lambdas, recovery)
 
     index_spread = np.sum(weights * spreads)
     return index_spread
@@ -0,0 +1,178 @@
+"""
+Empirical spread correlation over rolling windows.
+
+The window sums (sum x, sum x x^T) are updated by adding the dates entering the
+window and removing the ones leaving it, so each step costs O(step * n^2)
+instead of O(window * n^2). Results are yielded one window at a time and only
+the current n x n matrix is held in memory.
+"""
+import numpy as np
+import pandas as pd
+
+
+def spread_changes(df: pd.DataFrame, log: bool = False) -> pd.DataFrame:
+    """
+    Daily spread changes (dates x names) from the long frame returned by spreads_to_df.
+    Missing quotes are carried forward, so a missing day counts as no change.
+    """
+    wide = df.pivot_table(index="Date", columns="Company", values="cds_flat_spread").sort_index().ffill()
+    changes = np.log(wide).diff() if log else wide.diff()
+    return changes.iloc[1:].fillna(0.0)
+
+
+def rolling_covariance(changes: pd.DataFrame, window: int, step: int = 1, recompute_every: int = 250):
+    """
+    Yields (date, covariance) for every window ending on every step-th date.
+
+    :param recompute_every: rebuild the sums from scratch after this many updates to stop rounding drift
+    """
+    X = changes.to_numpy(dtype=float)
+    dates = changes.index
+    n_dates = X.shape[0]
+    if window < 2 or window > n_dates:
+        raise ValueError(f"window must be between 2 and {n_dates}, got {window}")
+
+    def full(end):
+        block = X[end - window + 1:end + 1]
+        return block.sum(axis=0), block.T @ block
+
+    end = window - 1
+    S, P = full(end)
+    updates = 0
+    while True:
+        cov = (P - np.outer(S, S) / window) / (window - 1)
+        yield dates[end], cov
+
+        prev, end = end, end + step
+        if end >= n_dates:
+            break
+
+        updates += 1
+        if step >= window or updates % recompute_every == 0:
+            S, P = full(end)
+            continue
+
+        add = X[prev + 1:end + 1]
+        rem = X[prev - window + 1:end - window + 1]
+        S += add.sum(axis=0) - rem.sum(axis=0)
+        P += add.T @ add - rem.T @ rem
+
+
+def cov_to_corr(cov: np.ndarray) -> np.ndarray:
+    std = np.sqrt(np.clip(np.diag(cov), 0.0, None))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inv = np.where(std > 0, 1.0 / std, 0.0)
+    corr = cov * inv[:, None] * inv[None, :]
+    np.fill_diagonal(corr, 1.0)
+    return np.clip(corr, -1.0, 1.0)
+
+
+def shrink_correlation(corr: np.ndarray, shrinkage: float) -> np.ndarray:
+    """
+    Linear shrinkage towards the constant-correlation target (average off-diagonal
+    correlation), which keeps the level of co-movement the copula calibrates to.
+    """
+    n = corr.shape[0]
+    if shrinkage <= 0 or n < 2:
+        return corr
+    mean_corr = (corr.sum() - n) / (n * (n - 1))
+    shrunk = (1.0 - shrinkage) * corr + shrinkage * mean_corr
+    np.fill_diagonal(shrunk, 1.0)
+    return shrunk
+
+
+def rolling_correlation(changes: pd.DataFrame, window: int, step: int = 1, shrinkage: float = 0.1):
+    """
+    Yields (date, correlation) for every rolling window, columns ordered as changes.columns.
+    """
+    for date, cov in rolling_covariance(changes, window, step):
+        yield date, shrink_correlation(cov_to_corr(cov), shrinkage)
+
+
+def _top_eigen(corr: np.ndarray, V: np.ndarray, n_iter: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Subspace iteration for the leading eigenpairs, warm-started from the previous
+    window's eigenvectors so a couple of matrix products per window are enough.
+    """
+    for _ in range(n_iter):
+        V, _ = np.linalg.qr(corr @ V)
+    # Rayleigh-Ritz on the small k x k problem
+    vals, vecs = np.linalg.eigh(V.T @ corr @ V)
+    order = np.argsort(vals)[::-1]
+    return vals[order], V @ vecs[:, order]
+
+
+def factor_loadings(
+    corr: np.ndarray,
+    n_factors: int = 1,
+    V0: np.ndarray | None = None,
+    n_iter: int = 3,
+    max_iter: int = 100,
+    tol: float = 1e-8,
+) -> np.ndarray:
+    """
+    Principal-factor loadings B (n_names x n_factors) with B B^T ~ corr off the diagonal.
+
+    Plain principal components keep the unit diagonal and overstate the loadings
+    (B_i^2 = rho + (1 - rho) / n for an equicorrelated matrix), so the diagonal is
+    replaced by the communalities h_i^2 = sum_k B_ik^2 and the leading eigenpairs
+    recomputed until h^2 settles. Rows are scaled so that sum_k B_ik^2 < 1, as the
+    Gaussian copula requires.
+    """
+    cap = 1.0 - 1e-6
+    reduced = np.array(corr, dtype=float)
+    V = V0
+    h2 = np.diag(reduced).copy()
+    for _ in range(max_iter):
+        if V is None:
+            vals, vecs = np.linalg.eigh(reduced)
+            vals, V = vals[::-1][:n_factors], vecs[:, ::-1][:, :n_factors]
+        else:
+            vals, V = _top_eigen(reduced, V, n_iter)
+        B = V * np.sqrt(np.clip(vals, 0.0, None))
+
+        h2_new = np.clip((B ** 2).sum(axis=1), 0.0, cap)
+        done = np.max(np.abs(h2_new - h2)) < tol
+        h2 = h2_new
+        if done:
+            break
+        np.fill_diagonal(reduced, h2)
+
+    # sign convention: positive average loading on each factor
+    B *= np.where(B.sum(axis=0) < 0, -1.0, 1.0)
+
+    norm = np.sqrt((B ** 2).sum(axis=1))
+    B[norm > cap] *= (cap / norm[norm > cap])[:, None]
+    return B
+
+
+def rolling_factor_loadings(
+    changes: pd.DataFrame,
+    window: int,
+    n_factors: int = 1,
+    step: int = 1,
+    shrinkage: float = 0.1,
+    n_iter: int = 3,
+) -> pd.DataFrame:
+    """
+    Factor loadings per window as a (Date, Company) x (b1..bk) frame.
+    Only the loadings are kept, so memory is O(n_dates * n_names * n_factors).
+    """
+    names = changes.columns
+    frames = []
+    V = None
+    for date, corr in rolling_correlation(changes, window, step, shrinkage):
+        B = factor_loadings(corr, n_factors, V0=V, n_iter=n_iter)
+        col_norm = np.linalg.norm(B, axis=0)
+        V = B / np.where(col_norm > 0, col_norm, 1.0)
+        frames.append(pd.DataFrame(
+            B,
+            index=pd.MultiIndex.from_product([[date], names], names=["Date", "Company"]),
+            columns=[f"b{k + 1}" for k in range(n_factors)],
+        ))
+    return pd.concat(frames)
+
+
+def loadings_to_rho(B: np.ndarray) -> np.ndarray:
+    """Per-name one-factor copula correlation rho_i = sum_k B_ik^2"""
+    return (np.asarray(B) ** 2).sum(axis=-1)
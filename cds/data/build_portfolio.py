@@ -1,4 +1,5 @@
 import json
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from cds.pricing.pd_table import rating_to_pd  # rating -> PD(T)
@@ -10,6 +11,13 @@ RATING_COL = "RATING"
 PATH_RATING = "xover_s43.json"
 PATH_MARKET_SPREADS = "fixed_spreads.json"
 PATH_MARKET_INDEX_EXCEL = "timeserieItems.xlsx"
+PATH_CDX_HY_ALL_SERIES = "CDX_HY_all_series.xlsx"
+PATH_CDX_HY_DEFAULTS = "CDX_HY_Defaults.xlsx"
+
+# Compact panels store dates as int32 day numbers since this epoch
+DATE_EPOCH = pd.Timestamp("1970-01-01")
+
+CDX_SHEET_COLUMNS = ["Empty", "Company", "Weight", "Currency", "Seniority", "RED_Code", "SP_ID"]
 
 RATINGS_AVAILABLE = {
     "CCC-",
@@ -47,7 +55,13 @@ def load_json(path_json):
     with open(path, "r") as f:
         return json.load(f)
 
-def build_rating_df(path_json: str = PATH_RATING):
+def encode_dates(dates) -> np.ndarray:
+    return ((pd.to_datetime(dates) - DATE_EPOCH) // pd.Timedelta(days=1)).to_numpy(dtype=np.int32)
+
+def decode_dates(codes) -> pd.DatetimeIndex:
+    return DATE_EPOCH + pd.to_timedelta(np.asarray(codes, dtype=np.int64), unit="D")
+
+def build_rating_df(path_json: str = PATH_RATING, compact: bool = False):
     raw = load_json(path_json)
     df = pd.DataFrame(raw["Data"])
 
@@ -60,8 +74,8 @@ def build_rating_df(path_json: str = PATH_RATING):
     )
     
     # Use backup column if primary rating is missing
-    if is_missing.any():
-        backup_col = "Unnamed: 21"
+    backup_col = "Unnamed: 21"
+    if is_missing.any() and backup_col in df.columns:
         backup_available = (
             ~df.loc[is_missing, backup_col].isna() &
             (df.loc[is_missing, backup_col].apply(lambda x: str(x).strip() != ""))
@@ -84,27 +98,41 @@ def build_rating_df(path_json: str = PATH_RATING):
 
     df = df[~is_missing].copy()
 
-    return df[["Company Name", RATING_COL]].reset_index(drop=True)
+    df = df[["Company Name", RATING_COL]].reset_index(drop=True)
+    if compact:
+        df = df.astype({"Company Name": "category", RATING_COL: "category"})
+    return df
+
+def build_portfolio_df(path_rating = PATH_RATING, path_spreads = PATH_MARKET_SPREADS, compact: bool = False) -> pd.DataFrame:
+    rating_df = build_rating_df(path_rating, compact)
+    market_spreads_df = spreads_to_df(path_spreads, compact)
+    df = pd.merge(rating_df, market_spreads_df, left_on="Company Name", right_on="Company", how="inner")
+    if compact:
+        # merging categoricals with different categories falls back to object
+        df = df.astype({"Company Name": "category", "Company": "category", RATING_COL: "category"})
+    return df
 
-def build_portfolio_df(path_rating = PATH_RATING, path_spreads = PATH_MARKET_SPREADS) -> pd.DataFrame:
-    rating_df = build_rating_df(path_rating)
-    market_spreads_df = spreads_to_df(path_spreads)
-    return pd.merge(rating_df, market_spreads_df, left_on="Company Name", right_on="Company", how="inner")
+def spreads_to_df(path_json: str = PATH_MARKET_SPREADS, compact: bool = False) -> pd.DataFrame:
+    """
+    Long frame of (Company, Date, cds_flat_spread).
 
-def spreads_to_df(path_json: str = PATH_MARKET_SPREADS) -> pd.DataFrame:
+    With compact=True the company is categorical and Date is an int32 day number
+    (see decode_dates) instead of a datetime, which avoids repeating the name on
+    every row and halves the date column.
+    """
     raw = load_json(path_json)
-    rows = []
+    companies, dates, spreads = [], [], []
     for c in raw:
-        company = c["Company"]
-
-        for entry in c["Data"]:
-            rows.append({
-                "Company": company,
-                "Date": pd.to_datetime(entry["Date"]),
-                "cds_flat_spread": entry["Spread"],
-            })
-
-    df = pd.DataFrame(rows)
+        data = c["Data"]
+        companies.extend([c["Company"]] * len(data))
+        dates.extend(entry["Date"] for entry in data)
+        spreads.extend(entry["Spread"] for entry in data)
+
+    df = pd.DataFrame({
+        "Company": pd.Categorical(companies) if compact else companies,
+        "Date": encode_dates(dates) if compact else pd.to_datetime(dates),
+        "cds_flat_spread": spreads,
+    })
     df = df.sort_values(["Company", "Date"])
     return df
 
@@ -114,7 +142,85 @@ def market_data(path_excel: str = PATH_MARKET_INDEX_EXCEL):
     return df
 
 def load_all_series_cdx_hy_us_data() -> pd.ExcelFile:
-    return pd.ExcelFile(Path(__file__).parent / "CDX_HY_all_series.xlsx")
+    return pd.ExcelFile(Path(__file__).parent / PATH_CDX_HY_ALL_SERIES)
+
+def _parse_cdx_series(path: Path) -> pd.DataFrame:
+    # sheet_name=None parses the whole workbook in a single openpyxl pass
+    sheets = pd.read_excel(path, sheet_name=None, header=None, skiprows=2, names=CDX_SHEET_COLUMNS)
+    frames = []
+    for series, df in sheets.items():
+        df = df.drop(columns=["Empty", "SP_ID"]).dropna(subset=["RED_Code"])
+        df.insert(0, "Series", series)
+        frames.append(df)
+
+    df = pd.concat(frames, ignore_index=True)
+    df["Weight"] = pd.to_numeric(df["Weight"], errors="coerce")
+    df["RED_Code"] = df["RED_Code"].astype(str).str.strip()
+    df = df.drop_duplicates(subset=["Series", "RED_Code"])
+    for col in ["Series", "Currency", "Seniority"]:
+        df[col] = df[col].astype("category")
+    return df.reset_index(drop=True)
+
+def load_cdx_constituents(
+    path_excel: str = PATH_CDX_HY_ALL_SERIES,
+    path_cache: str | None = None,
+    refresh: bool = False,
+) -> pd.DataFrame:
+    """
+    Constituents of every CDX HY series in one table
+    (Series, Company, Weight, Currency, Seniority, RED_Code).
+
+    The parsed table is cached next to the workbook (<workbook>.constituents.pkl
+    unless path_cache is given) together with the workbook path and mtime, and
+    only reused while both match.
+    """
+    path = (Path(__file__).parent / path_excel).resolve()
+    cache = Path(__file__).parent / path_cache if path_cache else path.with_suffix(".constituents.pkl")
+    source = {"path": str(path), "mtime": path.stat().st_mtime}
+
+    if not refresh and cache.exists():
+        cached = pd.read_pickle(cache)
+        if isinstance(cached, dict) and cached.get("source") == source:
+            return cached["data"]
+
+    df = _parse_cdx_series(path)
+    pd.to_pickle({"source": source, "data": df}, cache)
+    return df
+
+def load_cdx_defaults(path_excel: str = PATH_CDX_HY_DEFAULTS) -> pd.DataFrame:
+    path = Path(__file__).parent / path_excel
+    df = pd.read_excel(path)
+    df["Default_Date"] = pd.to_datetime(df["Default_Date"])
+    df["RED_Code"] = df["RED_Code"].astype(str).str.strip()
+    # same as building a RED_Code -> date dict, the last entry wins
+    return df.drop_duplicates(subset=["RED_Code"], keep="last").reset_index(drop=True)
+
+def _series_defaults(constituents: pd.DataFrame, defaults: pd.DataFrame) -> pd.DataFrame:
+    df = constituents[["Series", "RED_Code", "Weight"]].merge(
+        defaults[["RED_Code", "Default_Date"]], on="RED_Code", how="inner"
+    )
+    df = df.rename(columns={"Default_Date": "Date"})
+    return df.sort_values(["Series", "Date"], kind="stable").reset_index(drop=True)
+
+def series_default_paths(constituents: pd.DataFrame, defaults: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cumulative number of defaults over time for every series
+    (Series, Date, Cumulative_Defaults).
+    """
+    df = _series_defaults(constituents, defaults)
+    df["Cumulative_Defaults"] = df.groupby("Series", observed=True).cumcount() + 1
+    return df[["Series", "Date", "Cumulative_Defaults"]]
+
+def series_survivor_factors(constituents: pd.DataFrame, defaults: pd.DataFrame) -> pd.DataFrame:
+    """
+    Index factor after each default: share of the original series weight that
+    has not defaulted (Series, Date, RED_Code, Defaulted_Weight, Factor).
+    """
+    total = constituents.groupby("Series", observed=True)["Weight"].sum().rename("Total_Weight")
+    df = _series_defaults(constituents, defaults).join(total, on="Series")
+    df["Defaulted_Weight"] = df.groupby("Series", observed=True)["Weight"].cumsum() / df["Total_Weight"]
+    df["Factor"] = 1.0 - df["Defaulted_Weight"]
+    return df[["Series", "Date", "RED_Code", "Defaulted_Weight", "Factor"]]
 
 
 
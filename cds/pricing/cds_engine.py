@@ -1,6 +1,8 @@
 import pandas as pd
 from dataclasses import dataclass
+from datetime import date
 from cds.pricing.cds_pricing_functions import *
+from cds.pricing.schedule import Schedule
 
 @dataclass
 class Params:
@@ -9,6 +11,7 @@ class Params:
     recovery: float
     coupon: int
     freq: int
+    trade_date: date | None = None  # enables IMM dates and ACT/360 accruals
 
 class CDS:
     def __init__(self, params: Params):
@@ -17,6 +20,7 @@ class CDS:
         self.recovery = params.recovery
         self.coupon = params.coupon
         self.freq = params.freq
+        self.schedule = Schedule.from_params(params)
     
     def hazard_from_rating(self, rating):
         hazard = rating_to_hazard(rating, self.T)
@@ -31,37 +35,33 @@ class CDS:
         :param rating: Credit rating of the company
         """
         hazard_rate = self.hazard_from_rating(rating)
-        return fair_cds_spread(
-            self.T, self.freq, self.r, hazard_rate, self.recovery
-        )
+        return float(self.schedule.fair_spread(hazard_rate, self.recovery))
 
 
     def upfront(self, flat_spread: float, hazard: float) -> float:
-        pv01 = risky_pv01(self.T, self.freq, self.r, hazard)
+        pv01 = float(self.schedule.risky_pv01(hazard))
         upfr = (self.coupon - flat_spread) * pv01
         return upfr
 
 
     def bond_equivalent_spread(self, flat_spread, hazard_rate):
         upfr = self.upfront(flat_spread, hazard_rate)
-        pv01 = risky_pv01(self.T, self.freq, self.r, hazard_rate)
+        pv01 = float(self.schedule.risky_pv01(hazard_rate))
         be = upfr / pv01 + self.coupon
         return be
     
     def bond_equivalent_price(self, flat_spread, haz):
-        pv01 = risky_pv01(self.T, self.freq, self.r, haz)
+        pv01 = float(self.schedule.risky_pv01(haz))
         upfront = (flat_spread - self.coupon) * pv01
         price = 100 - (upfront * 100)
         return price
 
     def index_from_component_spreads(self, df: pd.DataFrame) -> dict[str, float]:
-        be_prices = []
-        for _, row in df.iterrows():
-            flat_spread = row["cds_flat_spread"] / 10000
-            hazard = flat_spread / (1 - self.recovery)
-            price = self.bond_equivalent_price(flat_spread, hazard)
-            be_prices.append(price)
-        avg_index_price = sum(be_prices) / len(be_prices)
+        flat_spreads = df["cds_flat_spread"].to_numpy(dtype=float) / 10000
+        hazards = flat_spreads / (1 - self.recovery)
+        pv01s = self.schedule.risky_pv01(hazards)
+        be_prices = 100 - (flat_spreads - self.coupon) * pv01s * 100
+        avg_index_price = be_prices.mean()
 
         # find the spread that gives our price
         target_price = avg_index_price
@@ -71,7 +71,7 @@ class CDS:
         for _ in range(100):
             mid = (low + high) / 2
             h_guess = mid /  (1 - self.recovery)
-            pv01_guess = risky_pv01(self.T, self.freq, self.r, h_guess)
+            pv01_guess = float(self.schedule.risky_pv01(h_guess))
 
             upfront_guess = (mid - self.coupon) * pv01_guess
             price_guess = 100 - (upfront_guess * 100)
@@ -4,6 +4,7 @@ import pandas as pd
 import matplotlib.pyplot as plt
 
 from cds.pricing.pd_table import rating_to_pd
+from cds.pricing.schedule import build_schedule
 from cds.data.build_portfolio import build_portfolio_df
 
 T = 5.0          # 5-year CDS
@@ -77,32 +78,12 @@ def survival(lam, t):
 
 
 def risky_pv01(T, freq, r, lam):
-    dt = 1.0 / freq
-    n = int(T * freq)
-
-    pv01 = 0.0
-    t_prev = 0.0
-    V_prev = survival(lam, t_prev)
-
-    for i in range(1, n + 1):
-        t = i * dt
-        V_t = survival(lam, t)
-        pv01 += dt * math.exp(-r * t) * 0.5 * (V_prev + V_t)
-        V_prev = V_t
-
-    return pv01
+    return float(build_schedule(T, freq, r).risky_pv01(lam))
 
 
 def protection_leg(T, r, lam, R, steps=1000):
-    dt = T / steps
-    pv = 0.0
-
-    for i in range(1, steps + 1):
-        t = i * dt
-        V_t = survival(lam, t)
-        pv += math.exp(-r * t) * (1 - R) * lam * V_t * dt
-
-    return pv
+    # the protection leg does not depend on the coupon frequency
+    return float(build_schedule(T, 1, r, steps=steps).protection_leg(lam, R))
 
 
 def fair_cds_spread(T, freq, r, lam, R):
@@ -0,0 +1,137 @@
+"""
+Premium and protection leg grids, built once per contract and reused by every
+name and solver iteration so that pricing reduces to survival-weighted dot products.
+
+Without a trade date the grid is the stylised one used so far (T * freq equal
+accruals of 1/freq). With a trade date it follows the standard CDS conventions:
+maturity on 20 Jun / 20 Dec set by the semi-annual index roll (20 Mar / 20 Sep),
+coupons on the 20th of every 12/freq months (IMM dates for freq=4) adjusted
+to the following weekday, ACT/360 accruals and ACT/365F times for discounting.
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import lru_cache
+
+import numpy as np
+
+from cds.backends import get_backend
+
+PROTECTION_STEPS = 1000
+ROLL_MONTHS = (3, 9)
+
+
+def _add_months(d: date, months: int) -> date:
+    m = d.month - 1 + months
+    return date(d.year + m // 12, m % 12 + 1, d.day)
+
+
+def _adjust_following(d: date) -> date:
+    while d.weekday() >= 5:
+        d += timedelta(days=1)
+    return d
+
+
+def last_roll_date(d: date) -> date:
+    """Last 20 Mar / 20 Sep on or before d"""
+    for year in (d.year, d.year - 1):
+        for month in reversed(ROLL_MONTHS):
+            roll = date(year, month, 20)
+            if roll <= d:
+                return roll
+
+
+def maturity_date(trade_date: date, T: int) -> date:
+    """Standard maturity: T years after the 20 Jun / 20 Dec following the last roll"""
+    return _add_months(last_roll_date(trade_date), 3 + 12 * T)
+
+
+def coupon_dates(trade_date: date, T: int, freq: int) -> list[date]:
+    """Unadjusted coupon dates from the last one on/before trade_date up to maturity"""
+    step = 12 // freq
+    maturity = maturity_date(trade_date, T)
+    dates = [maturity]
+    while dates[-1] > trade_date:
+        dates.append(_add_months(dates[-1], -step))
+    return dates[::-1]
+
+
+@dataclass(frozen=True, eq=False)
+class Schedule:
+    # premium leg
+    pay_times: np.ndarray     # year fractions of payment dates
+    accruals: np.ndarray      # accrual fraction of each period
+    start_times: np.ndarray   # year fraction where each accrual period starts
+    pay_df: np.ndarray        # discount factors at payment dates
+    # protection leg
+    nodes: np.ndarray         # integration nodes on (0, maturity]
+    node_dt: float
+    node_df: np.ndarray
+
+    @classmethod
+    def from_params(cls, params, steps: int = PROTECTION_STEPS) -> "Schedule":
+        return build_schedule(params.T, params.freq, params.r, params.trade_date, steps)
+
+    @property
+    def maturity(self) -> float:
+        return float(self.nodes[-1])
+
+    def risky_pv01(self, lam):
+        """
+        Risky annuity for a flat hazard rate (scalar or array of rates).
+        Survival is averaged over each accrual period.
+        """
+        lam = np.asarray(lam, dtype=float)
+        flat = lam.ravel()
+        weights = 0.5 * self.accruals * self.pay_df
+        kernel = get_backend().survival_dot
+        pv01 = kernel(flat, self.start_times, weights) + kernel(flat, self.pay_times, weights)
+        return pv01.reshape(lam.shape)
+
+    def protection_leg(self, lam, R: float):
+        lam = np.asarray(lam, dtype=float)
+        V = get_backend().survival_dot(lam.ravel(), self.nodes, self.node_df * self.node_dt).reshape(lam.shape)
+        return (1 - R) * lam * V
+
+    def fair_spread(self, lam, R: float):
+        return self.protection_leg(lam, R) / self.risky_pv01(lam)
+
+
+@lru_cache(maxsize=128)
+def build_schedule(T, freq: int, r: float, trade_date: date | None = None, steps: int = PROTECTION_STEPS) -> Schedule:
+    """
+    Cached on its arguments, so every caller with the same contract shares one grid.
+    """
+    if trade_date is None:
+        dt = 1.0 / freq
+        n = int(T * freq)
+        pay_times = np.arange(1, n + 1) * dt
+        accruals = np.full(n, dt)
+        start_times = pay_times - dt
+        maturity = float(T)
+    else:
+        dates = coupon_dates(trade_date, int(T), freq)
+        unadjusted_end = dates[-1]
+        dates = [_adjust_following(d) for d in dates[:-1]] + [unadjusted_end]
+        starts = [max(d, trade_date) for d in dates[:-1]]  # clean: accrue from the trade date
+        ends = dates[1:]
+        days = np.array([(e - s).days for s, e in zip(starts, ends)], dtype=float)
+        days[-1] += 1  # the last period includes the maturity date
+        accruals = days / 360.0
+        start_times = np.array([(s - trade_date).days for s in starts], dtype=float) / 365.0
+        pay_times = np.array([(e - trade_date).days for e in ends], dtype=float) / 365.0
+        maturity = float(pay_times[-1])
+
+    node_dt = maturity / steps
+    nodes = np.arange(1, steps + 1) * node_dt
+    arrays = {
+        "pay_times": pay_times,
+        "accruals": accruals,
+        "start_times": start_times,
+        "pay_df": np.exp(-r * pay_times),
+        "nodes": nodes,
+        "node_df": np.exp(-r * nodes),
+    }
+    # the cached grid is shared by every caller, so it must not be edited in place
+    for arr in arrays.values():
+        arr.setflags(write=False)
+    return Schedule(node_dt=node_dt, **arrays)
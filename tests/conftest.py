@@ -0,0 +1,20 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cds.backends import DEFAULT_BACKEND, ENV_VAR, set_backend
+
+
+@pytest.fixture
+def portfolio() -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    n = 125
+    return pd.DataFrame({"Q_T": rng.uniform(0.005, 0.4, n), "w": np.full(n, 1.0 / n)})
+
+
+@pytest.fixture
+def use_backend(monkeypatch):
+    """Selects a backend for one test and restores the default afterwards."""
+    monkeypatch.delenv(ENV_VAR, raising=False)
+    yield set_backend
+    set_backend(DEFAULT_BACKEND)
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from scipy.stats import norm
+
+from cds.backends import numpy_backend
+from cds.correlation.correlation_analysis import loss_distribution
+from cds.pricing.schedule import build_schedule
+
+pytest.importorskip("numba")
+from cds.backends import numba_backend  # noqa: E402
+
+RHOS = [0.0, 0.3, 0.8, 0.95, 0.999]
+# both backends round N's argument and value to float32 in compact mode, but an
+# erfc / ndtr difference in the last float64 bit can still flip a float32 rounding
+ATOL = {np.float64: 1e-12, np.float32: 1e-9}
+
+
+def _loss_inputs(portfolio, rho, n_sims=50_000):
+    Q_T = portfolio["Q_T"].to_numpy()
+    F = np.random.default_rng(0).standard_normal(n_sims)
+    rho = np.full(len(Q_T), rho)
+    return norm.ppf(Q_T), F, np.sqrt(rho), np.sqrt(1.0 - rho), portfolio["w"].to_numpy()
+
+
+def test_survival_dot_matches():
+    rng = np.random.default_rng(1)
+    lam = rng.uniform(0.0, 0.5, 1000)
+    times = np.linspace(0.0, 10.0, 400)
+    weights = rng.uniform(0.0, 1.0, 400)
+
+    np.testing.assert_allclose(
+        numba_backend.survival_dot(lam, times, weights),
+        numpy_backend.survival_dot(lam, times, weights),
+        rtol=1e-13,
+    )
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+@pytest.mark.parametrize("rho", RHOS)
+def test_portfolio_loss_matches(portfolio, rho, dtype):
+    args = _loss_inputs(portfolio, rho)
+    L_numpy = numpy_backend.portfolio_loss(*args, 0.6, dtype)
+    L_numba = numba_backend.portfolio_loss(*args, 0.6, dtype)
+
+    assert L_numpy.dtype == L_numba.dtype == np.float64
+    np.testing.assert_allclose(L_numba, L_numpy, rtol=0, atol=ATOL[dtype])
+
+
+def test_fair_spread_matches(use_backend):
+    lam = np.linspace(1e-4, 0.5, 200)
+    spreads = {}
+    for name in ["numpy", "numba"]:
+        use_backend(name)
+        spreads[name] = build_schedule(5, 4, 0.02).fair_spread(lam, 0.4)
+
+    np.testing.assert_allclose(spreads["numba"], spreads["numpy"], rtol=1e-13)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("rho", RHOS)
+def test_loss_distribution_matches(portfolio, use_backend, rho, compact):
+    L = {}
+    for name in ["numpy", "numba"]:
+        use_backend(name)
+        L[name] = loss_distribution(portfolio, rho, n_sims=50_000, seed=1, compact=compact)
+
+    atol = ATOL[np.float32 if compact else np.float64]
+    np.testing.assert_allclose(L["numba"], L["numpy"], rtol=0, atol=atol)
@@ -0,0 +1,62 @@
+import json
+
+import pandas as pd
+import pytest
+
+from cds.cli import main
+
+DATES = ["2025-09-01", "2025-09-02", "2025-09-03"]
+NAMES = {"Alpha SA": ("BB+", 180.0), "Beta AG": ("B", 420.0), "Gamma PLC": ("BBB-", 95.0)}
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    ratings = {"Data": [{"Company Name": name, "RATING": rating} for name, (rating, _) in NAMES.items()]}
+    # unrated name and no "Unnamed: 21" backup column, as in cds/data/rating_data.json
+    ratings["Data"].append({"Company Name": "Unrated NV", "RATING": ""})
+    spreads = [
+        {"Company": name, "Data": [{"Date": d, "Spread": spread + 5 * i} for i, d in enumerate(DATES)]}
+        for name, (_, spread) in NAMES.items()
+    ]
+    rating_path = tmp_path / "ratings.json"
+    spreads_path = tmp_path / "spreads.json"
+    rating_path.write_text(json.dumps(ratings))
+    spreads_path.write_text(json.dumps(spreads))
+    return rating_path, spreads_path
+
+
+def run_cli(inputs, out, *extra):
+    rating_path, spreads_path = inputs
+    main([
+        "--rating", str(rating_path), "--spreads", str(spreads_path), "--out", str(out),
+        "--workers", "1", "--format", "csv", "--n-sims", "2000", *extra,
+    ])
+    return pd.read_csv(out / "flat_spreads.csv"), pd.read_csv(out / "index.csv", parse_dates=["Date"])
+
+
+def test_cli_writes_both_tables(inputs, tmp_path):
+    flat, index = run_cli(inputs, tmp_path / "out")
+
+    assert list(flat.columns) == ["Company Name", "RATING", "cds_flat_spread"]
+    assert sorted(flat["Company Name"]) == sorted(NAMES)
+    assert (flat["cds_flat_spread"] > 0).all()
+
+    assert list(index.columns) == [
+        "Date", "n_names", "spread_avg_bp", "index_price_avg", "index_flat_calc_bp",
+        "loss_rho", "EL", "VaR_99", "ES_99",
+    ]
+    assert index["Date"].dt.strftime("%Y-%m-%d").tolist() == DATES
+    assert (index["n_names"] == len(NAMES)).all()
+
+
+def test_trade_date_only_dates_flat_spreads(inputs, tmp_path):
+    flat, index = run_cli(inputs, tmp_path / "plain")
+    flat_dated, index_dated = run_cli(inputs, tmp_path / "dated", "--trade-date", "2025-10-01")
+    _, index_imm = run_cli(inputs, tmp_path / "imm", "--imm-schedule")
+    _, index_imm_dated = run_cli(inputs, tmp_path / "imm_dated", "--trade-date", "2025-10-01", "--imm-schedule")
+
+    pd.testing.assert_frame_equal(index_dated, index)
+    assert not (flat_dated["cds_flat_spread"] == flat["cds_flat_spread"]).all()
+    # with --imm-schedule each date is priced on its own schedule, not on the --trade-date one
+    pd.testing.assert_frame_equal(index_imm_dated, index_imm)
+    assert not (index_imm["index_price_avg"] == index["index_price_avg"]).all()
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cds.backends import available_backends
+from cds.correlation.correlation_analysis import (
+    conditional_default_prob,
+    RECOVERY,
+    loss_distribution,
+    summarize_losses,
+)
+
+# documented next to COMPACT_DTYPE in cds/correlation/correlation_analysis.py
+ATOL = 1.25 * 2.0 ** -24 * (1 - RECOVERY)
+
+
+@pytest.mark.parametrize("backend", available_backends())
+@pytest.mark.parametrize("rho", [0.0, 0.3, 0.8, 0.95, 0.999, 0.99999])
+@pytest.mark.parametrize("n_names", [1, 5, 125])
+def test_compact_loss_within_bound(use_backend, backend, rho, n_names):
+    rng = np.random.default_rng(3)
+    portfolio = pd.DataFrame({"Q_T": rng.uniform(0.005, 0.4, n_names), "w": np.full(n_names, 1.0 / n_names)})
+    use_backend(backend)
+    L64 = loss_distribution(portfolio, rho, n_sims=200_000, seed=0)
+    L32 = loss_distribution(portfolio, rho, n_sims=200_000, seed=0, compact=True)
+
+    assert L32.dtype == np.float64
+    np.testing.assert_allclose(L32, L64, rtol=0, atol=ATOL)
+
+    s64, s32 = summarize_losses(L64), summarize_losses(L32)
+    for key in s64:
+        assert s32[key] == pytest.approx(s64[key], rel=0, abs=ATOL)
+
+
+def test_compact_loadings_within_bound(portfolio):
+    B = np.random.default_rng(2).uniform(0.2, 0.7, (len(portfolio), 2))
+    L64 = loss_distribution(portfolio, None, n_sims=100_000, seed=0, loadings=B)
+    L32 = loss_distribution(portfolio, None, n_sims=100_000, seed=0, loadings=B, compact=True)
+    np.testing.assert_allclose(L32, L64, rtol=0, atol=ATOL)
+
+
+def test_conditional_default_prob_compact_dtype(portfolio):
+    F = np.random.default_rng(0).standard_normal(1000)
+    Q64 = conditional_default_prob(portfolio["Q_T"].to_numpy(), F, 0.3)
+    Q32 = conditional_default_prob(portfolio["Q_T"].to_numpy(), F, 0.3, compact=True)
+
+    assert Q32.dtype == np.float32
+    np.testing.assert_allclose(Q32, Q64, rtol=0, atol=1e-6)
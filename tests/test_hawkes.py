@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from cds.default_correlation.hawkes import (
+    _excitation,
+    intensity,
+    neg_log_likelihood,
+    neg_log_likelihood_and_grad,
+    simulate_hawkes,
+)
+
+PARAMS = [(0.02, 0.05, 0.1), (0.5, 2.0, 5.0), (5.0, 25.0, 50.0)]
+
+
+def naive_nll(params, t, T):
+    mu, alpha, beta = params
+    lam = np.array([mu + alpha * np.exp(-beta * (t_i - t[t < t_i])).sum() for t_i in t])
+    return -np.log(lam).sum() + mu * T + alpha / beta * (1 - np.exp(-beta * (T - t))).sum()
+
+
+def naive_excitation(t, beta):
+    # strictly earlier events only; later ones get a zero weight instead of an overflowing exp
+    diffs = t[:, None] - t[None, :]
+    mask = np.tril(np.ones_like(diffs, dtype=bool), k=-1)
+    kernel = np.where(mask, np.exp(-beta * np.where(mask, diffs, 0.0)), 0.0)
+    return kernel.sum(axis=1), (-diffs * kernel).sum(axis=1)
+
+
+@pytest.fixture(params=PARAMS, ids=lambda p: f"beta={p[2]}")
+def events(request):
+    mu, alpha, beta = request.param
+    T = 200.0 / mu
+    return request.param, simulate_hawkes(mu, alpha, beta, T, seed=1), T
+
+
+def test_excitation_matches_naive_sum(events):
+    (_, _, beta), t, _ = events
+    A, dA = _excitation(t, beta)
+    A_ref, dA_ref = naive_excitation(t, beta)
+    np.testing.assert_allclose(A, A_ref, rtol=1e-10, atol=1e-300)
+    np.testing.assert_allclose(dA, dA_ref, rtol=1e-10, atol=1e-300)
+    assert np.all(dA <= 0)
+
+
+def test_excitation_stable_over_long_windows():
+    # closely spaced events far from the origin, where C - s*A cancelled catastrophically
+    t = np.array([0.0, 1e6, 1e6 + 0.01, 1e6 + 0.02, 1e6 + 0.5])
+    A, dA = _excitation(t, 50.0)
+    A_ref, dA_ref = naive_excitation(t, 50.0)
+    np.testing.assert_allclose(A, A_ref, rtol=1e-12)
+    np.testing.assert_allclose(dA, dA_ref, rtol=1e-9)
+
+
+def test_likelihood_matches_naive_sum(events):
+    params, t, T = events
+    assert neg_log_likelihood(params, t, T) == pytest.approx(naive_nll(params, t, T), rel=1e-12)
+
+
+def test_gradient_matches_finite_differences(events):
+    params, t, T = events
+    _, grad = neg_log_likelihood_and_grad(params, t, T)
+    for k in range(3):
+        h = 1e-6 * params[k]
+        up, down = list(params), list(params)
+        up[k] += h
+        down[k] -= h
+        fd = (neg_log_likelihood(up, t, T) - neg_log_likelihood(down, t, T)) / (2 * h)
+        assert grad[k] == pytest.approx(fd, rel=1e-5, abs=1e-6 * abs(T))
+
+
+def test_intensity_matches_brute_force(events):
+    (mu, alpha, beta), t, T = events
+    grid = np.concatenate([np.linspace(-1.0, T, 2001), t])  # include the event times themselves
+    lam = intensity(grid, t, mu, alpha, beta)
+    ref = np.array([mu + alpha * np.exp(-beta * (g - t[t < g])).sum() for g in grid])
+    np.testing.assert_allclose(lam, ref, rtol=1e-10)
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cds.correlation.rolling import factor_loadings, loadings_to_rho, rolling_covariance
+
+WINDOW = 20
+
+
+@pytest.fixture
+def changes():
+    rng = np.random.default_rng(5)
+    X = rng.standard_normal((130, 6)) @ rng.standard_normal((6, 6)) + 3.0  # correlated, non-zero mean
+    return pd.DataFrame(X, index=pd.date_range("2024-01-01", periods=len(X), freq="B"))
+
+
+@pytest.mark.parametrize("step, recompute_every", [
+    (1, 250),    # step < window
+    (7, 250),
+    (WINDOW, 250),
+    (33, 250),   # step > window
+    (3, 4),      # crosses several full rebuilds
+])
+def test_rolling_covariance_matches_np_cov(changes, step, recompute_every):
+    X = changes.to_numpy()
+    results = list(rolling_covariance(changes, WINDOW, step=step, recompute_every=recompute_every))
+
+    ends = list(range(WINDOW - 1, len(X), step))
+    assert [d for d, _ in results] == list(changes.index[ends])
+    for end, (_, cov) in zip(ends, results):
+        np.testing.assert_allclose(cov, np.cov(X[end - WINDOW + 1:end + 1], rowvar=False), rtol=1e-10, atol=1e-12)
+
+
+@pytest.mark.parametrize("n, rho", [(10, 0.3), (125, 0.2), (3, 0.9)])
+def test_factor_loadings_equicorrelated(n, rho):
+    corr = np.full((n, n), rho)
+    np.fill_diagonal(corr, 1.0)
+    warm = np.full((n, 1), 1.0 / np.sqrt(n))
+    # principal components would give rho + (1 - rho) / n
+    np.testing.assert_allclose(loadings_to_rho(factor_loadings(corr)), rho, atol=1e-6)
+    np.testing.assert_allclose(loadings_to_rho(factor_loadings(corr, V0=warm)), rho, atol=1e-6)
+
+
+def test_factor_loadings_fit_off_diagonal():
+    rng = np.random.default_rng(0)
+    B = rng.uniform(0.2, 0.6, (30, 2))
+    corr = B @ B.T
+    np.fill_diagonal(corr, 1.0)
+    off = ~np.eye(30, dtype=bool)
+    for V0 in (None, np.linalg.qr(rng.standard_normal((30, 2)))[0]):
+        B_hat = factor_loadings(corr, n_factors=2, V0=V0)
+        np.testing.assert_allclose((B_hat @ B_hat.T)[off], corr[off], atol=1e-6)
+        assert (loadings_to_rho(B_hat) < 1).all()
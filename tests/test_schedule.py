@@ -0,0 +1,82 @@
+import math
+from datetime import date
+
+import numpy as np
+import pytest
+
+from cds.pricing.schedule import build_schedule, coupon_dates, last_roll_date, maturity_date
+
+LAMS = [0.0, 0.002, 0.03, 0.25, 1.5]
+
+
+def loop_risky_pv01(T, freq, r, lam):
+    # the per-period loop the undated grid replaced
+    dt = 1.0 / freq
+    pv01, V_prev = 0.0, 1.0
+    for i in range(1, int(T * freq) + 1):
+        t = i * dt
+        V_t = math.exp(-lam * t)
+        pv01 += dt * math.exp(-r * t) * 0.5 * (V_prev + V_t)
+        V_prev = V_t
+    return pv01
+
+
+def loop_protection_leg(T, r, lam, R, steps=1000):
+    dt = T / steps
+    return sum(math.exp(-r * i * dt) * (1 - R) * lam * math.exp(-lam * i * dt) * dt for i in range(1, steps + 1))
+
+
+@pytest.mark.parametrize("trade_date, roll, maturity", [
+    (date(2026, 1, 23), date(2025, 9, 20), date(2030, 12, 20)),
+    (date(2026, 3, 19), date(2025, 9, 20), date(2030, 12, 20)),
+    (date(2026, 3, 20), date(2026, 3, 20), date(2031, 6, 20)),
+    (date(2026, 9, 19), date(2026, 3, 20), date(2031, 6, 20)),
+    (date(2026, 9, 21), date(2026, 9, 20), date(2031, 12, 20)),
+    (date(2026, 12, 31), date(2026, 9, 20), date(2031, 12, 20)),
+])
+def test_roll_and_maturity(trade_date, roll, maturity):
+    assert last_roll_date(trade_date) == roll
+    assert maturity_date(trade_date, 5) == maturity
+
+
+def test_coupon_dates():
+    dates = coupon_dates(date(2026, 1, 23), 5, 4)
+    assert dates[0] == date(2025, 12, 20)
+    assert dates[-1] == date(2030, 12, 20)
+    assert len(dates) == 21
+    assert all(d.day == 20 and d.month in (3, 6, 9, 12) for d in dates)
+
+    semi = coupon_dates(date(2026, 1, 23), 5, 2)
+    assert semi[0] == date(2025, 12, 20)
+    assert all(d.month in (6, 12) for d in semi)
+
+
+def test_dated_schedule_accruals():
+    # 2025-12-20 and 2026-06-20 fall on a Saturday, 2030-09-20 and 2030-12-20 on a Friday
+    s = build_schedule(5, 4, 0.02, date(2026, 1, 23))
+    days = np.rint(s.accruals * 360)
+
+    assert len(days) == 20
+    assert s.start_times[0] == 0.0                    # accrues from the trade date
+    assert days[0] == 56                              # 23 Jan -> Fri 20 Mar
+    assert days[1] == 94                              # 20 Mar -> Mon 22 Jun, adjusted
+    assert s.pay_times[1] == pytest.approx(150 / 365)
+    assert days[-1] == 92                             # 20 Sep -> 20 Dec plus the maturity date
+    assert s.maturity == pytest.approx((date(2030, 12, 20) - date(2026, 1, 23)).days / 365)
+    np.testing.assert_array_equal(s.start_times[1:], s.pay_times[:-1])
+
+
+@pytest.mark.parametrize("lam", LAMS)
+@pytest.mark.parametrize("T, freq", [(5, 4), (3, 2), (10, 12)])
+def test_undated_grid_matches_loops(T, freq, lam):
+    r, R = 0.02, 0.4
+    s = build_schedule(T, freq, r)
+    assert s.risky_pv01(lam) == pytest.approx(loop_risky_pv01(T, freq, r, lam), rel=2e-15, abs=2e-15)
+    assert s.protection_leg(lam, R) == pytest.approx(loop_protection_leg(T, r, lam, R), rel=2e-15, abs=2e-15)
+
+
+def test_cached_arrays_are_read_only():
+    s = build_schedule(5, 4, 0.02, date(2026, 1, 23))
+    assert build_schedule(5, 4, 0.02, date(2026, 1, 23)) is s
+    with pytest.raises(ValueError):
+        s.pay_df[0] = 0.0